@@ -1,23 +1,35 @@
 # File: api/api.py
-from ninja import NinjaAPI
+import asyncio
+import time
+
+import numpy as np
+import yfinance as yf
+from ninja import Body, NinjaAPI
 from ninja.errors import HttpError
 from celery.result import AsyncResult
-from api.models import Portfolio, Scenario, RiskOutput, AsyncTaskResponse, OptimizationResponse
-from api.models import Portfolio, Scenario, RiskOutput, AsyncTaskResponse, OptimizationResponse
+from django.core.cache import cache
+from api.models import Portfolio, PortfolioPosition, Scenario, RiskOutput, AsyncTaskResponse, OptimizationResponse
 from api.risk_engine import RiskCalculator, MarketData, fetch_benchmark_data
+from api.optimization import calculate_efficient_frontier, calculate_rebalancing_trades
 from api.tasks import calculate_risk_async
 from api.scenarios import get_all_scenarios, get_scenario_impact
+from api.renderers import ORJSONRenderer
 import celery
 
 api = NinjaAPI(
     title="RiskLens API",
     version="1.0.0",
-    description="Portfolio risk analysis with real-time market data and scenario testing"
+    description="Portfolio risk analysis with real-time market data and scenario testing",
+    renderer=ORJSONRenderer()
 )
 
+# Shared across requests so MarketData's response cache is effective and
+# yfinance session state is reused instead of rebuilt per call
+_market_data = MarketData()
+
 
 @api.post("/analyze", response=RiskOutput, tags=["Risk Analysis"])
-def analyze_portfolio(
+async def analyze_portfolio(
     request,
     portfolio: Portfolio,
     scenario: Scenario | None = None,
@@ -51,20 +63,24 @@ def analyze_portfolio(
     """
     try:
         # Pre-fetch data for enhanced analytics
-        md = MarketData()
+        md = _market_data
         tickers = [p.ticker for p in portfolio.positions]
-        
-        # 1. Fetch Sector Data (Metadata)
-        sector_data = md.get_asset_metadata(tickers)
-        
-        # 2. Fetch Benchmark Data (S&P 500)
-        benchmark_data = fetch_benchmark_data('^GSPC', period=period)
-        
-        # 3. Calculate Risk with enhanced data
+
+        # 1+2. Fetch Sector Data (Metadata) and Benchmark Data (S&P 500)
+        # concurrently: both are independent network fetches, so wall time
+        # is the slower of the two rather than their sum
+        sector_data, benchmark_data = await asyncio.gather(
+            asyncio.to_thread(md.get_asset_metadata, tickers),
+            asyncio.to_thread(fetch_benchmark_data, '^GSPC', period)
+        )
+
+        # 3. Calculate Risk with enhanced data (off the event loop; it
+        # fetches history and does the heavy numerics)
         calculator = RiskCalculator()
-        result = calculator.calculate_risk(
-            portfolio, 
-            scenario, 
+        result = await asyncio.to_thread(
+            calculator.calculate_risk,
+            portfolio,
+            scenario,
             period=period,
             benchmark_data=benchmark_data,
             sector_data=sector_data
@@ -76,6 +92,42 @@ def analyze_portfolio(
         raise HttpError(500, f"Internal server error: {str(e)}")
 
 
+@api.post("/analyze-fast", response=RiskOutput, tags=["Risk Analysis"])
+async def analyze_portfolio_fast(request, payload: dict = Body(...), period: str = '1Y'):
+    """
+    Analyze portfolio risk without re-validating the inbound body.
+
+    /analyze runs full Pydantic validation over every position (quantity
+    bounds, asset_class literal), which is redundant for trusted clients
+    that already validated the portfolio — e.g., our own frontend replaying
+    a saved portfolio. This variant assembles the models with
+    model_construct and falls back to full validation only if the raw
+    payload doesn't have the expected shape.
+
+    Args:
+        request: Django request object
+        payload: Raw portfolio dict ({"positions": [...]})
+        period: Time period for analysis (1M, 3M, 6M, 1Y, 3Y, 5Y, YTD)
+
+    Returns:
+        RiskOutput with comprehensive risk metrics
+    """
+    try:
+        positions = [
+            PortfolioPosition.model_construct(**p)
+            for p in payload['positions']
+        ]
+        portfolio = Portfolio.model_construct(positions=positions)
+    except (KeyError, TypeError):
+        # Shape mismatch: run the full validation path for a clear error
+        try:
+            portfolio = Portfolio.model_validate(payload)
+        except Exception as e:
+            raise HttpError(400, f"Invalid portfolio payload: {str(e)}")
+
+    return await analyze_portfolio(request, portfolio, None, period)
+
+
 @api.post("/analyze-async", response=AsyncTaskResponse, tags=["Risk Analysis"])
 def analyze_portfolio_async(request, portfolio: Portfolio, scenario: Scenario | None = None):
     """
@@ -105,13 +157,14 @@ def analyze_portfolio_async(request, portfolio: Portfolio, scenario: Scenario |
         }
     """
     try:
-        # Serialize to JSON
-        portfolio_json = portfolio.model_dump_json()
-        scenario_json = scenario.model_dump_json() if scenario else None
-        
+        # Hand plain dicts to Celery: its configured serializer does the one
+        # and only encoding pass, instead of JSON-in-JSON double escaping
+        portfolio_dict = portfolio.model_dump()
+        scenario_dict = scenario.model_dump() if scenario else None
+
         # Submit to Celery
-        task = calculate_risk_async.delay(portfolio_json, scenario_json)
-        
+        task = calculate_risk_async.delay(portfolio_dict, scenario_dict)
+
         return AsyncTaskResponse(task_id=task.id)
     except Exception as e:
         raise HttpError(500, f"Failed to queue task: {str(e)}")
@@ -145,21 +198,84 @@ def get_task_status(request, task_id: str):
             "result": { ... RiskOutput ... }
         }
     """
-    from celery.result import AsyncResult
-    
+    return _task_status_payload(task_id, AsyncResult(task_id))
+
+
+@api.get("/task/{task_id}/wait", tags=["Task Management"])
+def wait_for_task(request, task_id: str, timeout: float = 5.0):
+    """
+    Long-poll for an async task result.
+
+    Unlike /task/{task_id}, which returns the current status immediately and
+    forces clients into a polling loop, this endpoint subscribes to the
+    Celery result channel in Redis and returns as soon as the result is
+    published (or the timeout elapses). Fast tasks come back in
+    milliseconds instead of one client poll interval.
+
+    Args:
+        request: Django request object
+        task_id: Celery task ID from /analyze-async
+        timeout: Maximum seconds to wait for the result (default: 5,
+            capped at 30)
+
+    Returns:
+        Task status and result (if complete), same shape as /task/{task_id}
+    """
+    # Clamp the client-supplied wait: this is an unauthenticated endpoint
+    # and each wait pins a pub/sub subscription plus a threadpool slot
+    timeout = max(0.0, min(timeout, 30.0))
+
     task = AsyncResult(task_id)
-    
+
+    if not task.ready():
+        try:
+            import redis as redis_client
+            from django.conf import settings
+
+            # Celery's redis backend PUBLISHes the result to the task-meta
+            # channel when it stores it; block on that instead of polling
+            client = redis_client.Redis.from_url(settings.CELERY_RESULT_BACKEND)
+            pubsub = client.pubsub()
+            pubsub.subscribe(f'celery-task-meta-{task_id}')
+            try:
+                # get_message returns per message read (the SUBSCRIBE ack
+                # included), not per timeout window, so loop against a
+                # deadline until the result is published or time runs out
+                deadline = time.monotonic() + timeout
+                while not task.ready():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    message = pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=remaining
+                    )
+                    if message is not None and message.get('type') == 'message':
+                        break
+            finally:
+                pubsub.close()
+        except Exception:
+            # Redis unreachable (e.g., non-redis backend): bounded poll
+            try:
+                task.get(timeout=timeout, interval=0.05, propagate=False)
+            except Exception:
+                pass
+
+    return _task_status_payload(task_id, task)
+
+
+def _task_status_payload(task_id: str, task: AsyncResult) -> dict:
+    """Build the common status/result payload for task endpoints."""
     response = {
         "task_id": task_id,
         "status": task.status,
     }
-    
+
     if task.ready():
         if task.successful():
             response["result"] = task.result
         else:
             response["error"] = str(task.info)
-    
+
     return response
 
 
@@ -186,7 +302,13 @@ def list_scenarios(request):
             ...
         ]
     """
-    return get_all_scenarios()
+    # Scenario definitions are static; serve from Redis instead of
+    # rebuilding the list on every call
+    try:
+        return cache.get_or_set('scenarios:list', get_all_scenarios, 3600)
+    except Exception:
+        # Cache backend unavailable; fall back to building directly
+        return get_all_scenarios()
 
 
 @api.post("/scenarios/{scenario_id}/test", tags=["Scenarios"])
@@ -230,38 +352,69 @@ def test_scenario(request, scenario_id: str, portfolio_value: float):
 def validate_ticker(request, ticker: str):
     """
     Validate a stock ticker and return company info.
+
+    Definitive verdicts are cached in Redis for 5 minutes so repeated
+    validations of the same symbol (e.g., while a user types a
+    portfolio) don't re-hit yfinance. Lookup failures (network trouble,
+    rate limiting) are returned uncached, so a transient error never
+    marks a valid ticker invalid for every user for 5 minutes.
     """
+    cache_key = f'validate-ticker:{ticker}'
     try:
-        import yfinance as yf
-        data = yf.Ticker(ticker)
-        # Fast check: 'info' usually fetches basic metadata
-        info = data.info
-        
-        # Check if info is empty or quoteType is invalid
-        if not info or info.get('quoteType') == 'NONE' or info.get('symbol') is None:
-             return {"valid": False}
-        
-        # Must have a valid name
-        name = info.get('shortName') or info.get('longName')
-        if not name:
-             return {"valid": False}
-             
-        # Check for price data (ensure it's a tradeable asset with history)
-        # using 'regularMarketPrice', 'currentPrice', or 'previousClose'
-        price = info.get('currentPrice') or info.get('regularMarketPrice') or info.get('previousClose')
-        if not price:
-             return {"valid": False}
-        
-        return {
-            "valid": True,
-            "symbol": info.get('symbol', ticker),
-            "name": name,
-            "exchange": info.get('exchange', 'Unknown'),
-            "currency": info.get('currency', 'USD')
-        }
+        cached = cache.get(cache_key)
+    except Exception:
+        # Cache backend unavailable; validate directly below
+        cached = None
+    if cached is not None:
+        return cached
+
+    try:
+        result = _do_validate_ticker(ticker)
+    except Exception:
+        # Transient lookup failure: report invalid but don't poison the cache
+        return {"valid": False}
+
+    try:
+        cache.set(cache_key, result, 300)
     except Exception:
+        pass
+    return result
+
+
+def _do_validate_ticker(ticker: str) -> dict:
+    """
+    Perform the actual yfinance lookup behind /validate-ticker.
+
+    Raises on lookup failure so the caller can distinguish a transient
+    error (not cacheable) from a definitively invalid symbol.
+    """
+    data = yf.Ticker(ticker)
+    # Fast check: 'info' usually fetches basic metadata
+    info = data.info
+
+    # Check if info is empty or quoteType is invalid
+    if not info or info.get('quoteType') == 'NONE' or info.get('symbol') is None:
+         return {"valid": False}
+
+    # Must have a valid name
+    name = info.get('shortName') or info.get('longName')
+    if not name:
          return {"valid": False}
 
+    # Check for price data (ensure it's a tradeable asset with history)
+    # using 'regularMarketPrice', 'currentPrice', or 'previousClose'
+    price = info.get('currentPrice') or info.get('regularMarketPrice') or info.get('previousClose')
+    if not price:
+         return {"valid": False}
+
+    return {
+        "valid": True,
+        "symbol": info.get('symbol', ticker),
+        "name": name,
+        "exchange": info.get('exchange', 'Unknown'),
+        "currency": info.get('currency', 'USD')
+    }
+
 
 @api.post("/optimize", response=OptimizationResponse, tags=["Optimization"])
 def optimize_portfolio(request, portfolio: Portfolio, period: str = '1Y'):
@@ -283,33 +436,38 @@ def optimize_portfolio(request, portfolio: Portfolio, period: str = '1Y'):
         }
     """
     try:
-        from api.risk_engine import MarketData
-        from api.optimization import calculate_efficient_frontier, calculate_rebalancing_trades
-        import numpy as np
-        
         # Extract tickers
         tickers = [p.ticker for p in portfolio.positions]
         if not tickers:
             raise ValueError("Portfolio must have at least one position")
-            
+
         # Fetch historical data
-        md = MarketData()
+        md = _market_data
         market_data = md.fetch_history(tickers, period=period)
         if market_data['returns'].empty:
             raise ValueError("No market data found for tickers")
             
         # Calculate Efficient Frontier
         result = calculate_efficient_frontier(market_data['returns'])
-        
+
         # Calculate Rebalancing Trades (for Max Sharpe Portfolio)
-        total_value = sum(p.quantity * market_data['current_prices'][p.ticker] for p in portfolio.positions)
+        # Stage quantities and prices as arrays once; one BLAS dot replaces
+        # the per-position Python multiply-and-sum loop
+        current_prices = market_data['current_prices']
+        quantities = np.fromiter(
+            (p.quantity for p in portfolio.positions),
+            dtype=np.float64,
+            count=len(portfolio.positions)
+        )
+        prices = np.array([current_prices[p.ticker] for p in portfolio.positions])
+        total_value = float(quantities @ prices)
         target_weights = result['max_sharpe_portfolio']['weights']
         
         trades = calculate_rebalancing_trades(
             current_positions=portfolio.positions,
             target_weights=target_weights,
             total_value=total_value,
-            current_prices=market_data['current_prices']
+            current_prices=current_prices
         )
         
         result['rebalancing_trades'] = trades
@@ -346,8 +504,10 @@ def health_check(request):
 
 
 # --- Portfolio Management APIs ---
+import orjson
+from django.http import StreamingHttpResponse
 from api.auth import GoogleAuthBearer
-from api.models import SavedPortfolio
+from api.models import Position, SavedPortfolio
 from typing import List
 from ninja import Schema
 from datetime import datetime
@@ -357,55 +517,161 @@ class PortfolioSummary(Schema):
     name: str
     updated_at: datetime
     description: str | None = None
+    total_value: float | None = None
+    last_return: float | None = None
+    last_volatility: float | None = None
+    last_sharpe: float | None = None
 
 class PortfolioInput(Schema):
     name: str
     positions: List[dict]
     description: str | None = None
+    # Optional analytics snapshot from the client's last /analyze run;
+    # stored denormalized so list views render metrics without recompute
+    analytics: dict | None = None
+
+
+def _analytics_fields(analytics: dict | None) -> dict:
+    """Map a client analytics snapshot onto the denormalized columns."""
+    if not analytics:
+        return {}
+    return {
+        'total_value': analytics.get('total_value'),
+        'last_return': analytics.get('annualized_return'),
+        'last_volatility': analytics.get('volatility_annualized'),
+        'last_sharpe': analytics.get('sharpe_ratio'),
+    }
 
 @api.post("/portfolios", auth=GoogleAuthBearer(), response=PortfolioSummary, tags=["Cloud Sync"])
 def save_portfolio(request, payload: PortfolioInput):
     """Save a portfolio to the cloud for the authenticated user."""
     user = request.auth
-    
-    # Create new portfolio
-    p = SavedPortfolio.objects.create(
+
+    # Upsert on (user, name): re-saving an existing portfolio updates it
+    # in place instead of failing the unique constraint
+    p, _created = SavedPortfolio.objects.update_or_create(
         user=user,
         name=payload.name,
-        positions=payload.positions,
-        description=payload.description
+        defaults={
+            'positions': payload.positions,
+            'description': payload.description,
+            **_analytics_fields(payload.analytics)
+        }
     )
     return p
 
+@api.post("/portfolios/bulk", auth=GoogleAuthBearer(), response=List[PortfolioSummary], tags=["Cloud Sync"])
+def bulk_save_portfolios(request, payloads: List[PortfolioInput]):
+    """
+    Upsert a batch of portfolios in one statement.
+
+    Uses INSERT ... ON CONFLICT (user, name) DO UPDATE via bulk_create, so
+    saving N portfolios costs one round-trip instead of N SELECT+INSERT
+    pairs.
+    """
+    user = request.auth
+
+    # De-duplicate by name (last one wins): ON CONFLICT DO UPDATE cannot
+    # touch the same row twice in one statement on PostgreSQL
+    payloads = list({p.name: p for p in payloads}.values())
+
+    objs = [
+        SavedPortfolio(
+            user=user,
+            name=p.name,
+            positions=p.positions,
+            description=p.description,
+            **_analytics_fields(p.analytics)
+        )
+        for p in payloads
+    ]
+    SavedPortfolio.objects.bulk_create(
+        objs,
+        update_conflicts=True,
+        unique_fields=['user', 'name'],
+        update_fields=['positions', 'description', 'updated_at',
+                       'total_value', 'last_return', 'last_volatility', 'last_sharpe']
+    )
+    names = [p.name for p in payloads]
+    saved = list(SavedPortfolio.objects.filter(user=user, name__in=names).only(
+        'id', 'name', 'updated_at', 'description',
+        'total_value', 'last_return', 'last_volatility', 'last_sharpe'
+    ))
+
+    # Resync the normalized Position rows for the whole batch in two
+    # statements (bulk_create skips SavedPortfolio.save, which normally
+    # does this per object)
+    positions_by_name = {p.name: p.positions for p in payloads}
+    Position.objects.filter(portfolio__in=saved).delete()
+    Position.objects.bulk_create([
+        Position(
+            portfolio=sp,
+            ticker=pos.get('ticker', ''),
+            quantity=pos.get('quantity') or 0.0,
+            asset_class=pos.get('asset_class', '') or '',
+        )
+        for sp in saved
+        for pos in positions_by_name.get(sp.name, [])
+        if isinstance(pos, dict)
+    ])
+    return saved
+
 @api.get("/portfolios", auth=GoogleAuthBearer(), response=List[PortfolioSummary], tags=["Cloud Sync"])
-def list_portfolios(request):
-    """List all saved portfolios for the authenticated user."""
-    return SavedPortfolio.objects.filter(user=request.auth).order_by('-updated_at')
+def list_portfolios(request, format: str | None = None):
+    """
+    List all saved portfolios for the authenticated user.
+
+    Pass ?format=ndjson to stream the list as newline-delimited JSON: rows
+    are serialized straight off a queryset iterator, so memory stays
+    constant no matter how many portfolios the user has and clients can
+    parse rows as they arrive. The default remains a JSON array.
+    """
+    # The summary never exposes positions, so skip loading the JSON column
+    qs = SavedPortfolio.objects.filter(user=request.auth).only(
+        'id', 'name', 'updated_at', 'description',
+        'total_value', 'last_return', 'last_volatility', 'last_sharpe'
+    ).order_by('-updated_at')
+
+    if format == 'ndjson':
+        def stream():
+            for row in qs.iterator(chunk_size=100):
+                yield orjson.dumps({
+                    'id': row.id,
+                    'name': row.name,
+                    'updated_at': row.updated_at,
+                    'description': row.description,
+                    'total_value': row.total_value,
+                    'last_return': row.last_return,
+                    'last_volatility': row.last_volatility,
+                    'last_sharpe': row.last_sharpe
+                }) + b'\n'
+        return StreamingHttpResponse(stream(), content_type='application/x-ndjson')
+
+    return qs
 
 @api.get("/portfolios/{id}", auth=GoogleAuthBearer(), tags=["Cloud Sync"])
 def get_portfolio(request, id: int):
     """Load a specific portfolio."""
-    try:
-        p = SavedPortfolio.objects.get(id=id, user=request.auth)
-        return {
-            "id": p.id,
-            "name": p.name,
-            "positions": p.positions,
-            "description": p.description,
-            "updated_at": p.updated_at
-        }
-    except SavedPortfolio.DoesNotExist:
+    # We return a plain dict, so fetch values directly and skip model construction
+    p = SavedPortfolio.objects.filter(id=id, user=request.auth).values(
+        'id', 'name', 'positions', 'description', 'updated_at'
+    ).first()
+    if p is None:
         raise HttpError(404, "Portfolio not found")
+    return p
 
 @api.put("/portfolios/{id}", auth=GoogleAuthBearer(), response=PortfolioSummary, tags=["Cloud Sync"])
 def update_portfolio(request, id: int, payload: PortfolioInput):
     """Update an existing portfolio."""
     try:
-        p = SavedPortfolio.objects.get(id=id, user=request.auth)
+        # Full manager: the update rewrites the wide columns anyway
+        p = SavedPortfolio.full.get(id=id, user=request.auth)
         p.name = payload.name
         p.positions = payload.positions
         if payload.description is not None:
              p.description = payload.description
+        for field, value in _analytics_fields(payload.analytics).items():
+            setattr(p, field, value)
         p.save()
         return p
     except SavedPortfolio.DoesNotExist:
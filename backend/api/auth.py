@@ -1,4 +1,7 @@
-import os
+import hashlib
+import threading
+import time
+
 from ninja.security import HttpBearer
 from google.oauth2 import id_token
 from google.auth.transport import requests
@@ -8,14 +11,51 @@ from django.conf import settings
 # Hardcoded for now, but ideally moved to settings/env
 GOOGLE_CLIENT_ID = "937760292124-iifkr9bnc1gjrrg8na1paijnp36l5ia9.apps.googleusercontent.com"
 
+# Shared transport so repeated verifications reuse the same HTTPS connection
+# pool for Google's JWKS endpoint instead of opening a new one per request.
+_GOOGLE_TRANSPORT = requests.Request()
+
+# Cache of already-verified tokens: token digest -> (user_pk, expiry_epoch).
+# Verifying a Google ID token fetches Google's signing keys and re-checks the
+# RSA signature, adding ~50-300ms to every authenticated request. The same
+# bearer token is sent on every call during a session, so we short-circuit
+# repeat verifications until the token's own expiry (capped by a TTL).
+_TOKEN_CACHE_MAX = 4096
+_TOKEN_CACHE_TTL = 300  # seconds
+_token_cache: dict[str, tuple[int, float]] = {}
+_token_cache_lock = threading.Lock()
+
+
+def _token_cache_key(token: str) -> str:
+    # Hash so raw bearer tokens never sit in process memory longer than needed
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
 class GoogleAuthBearer(HttpBearer):
     def authenticate(self, request, token):
+        cache_key = _token_cache_key(token)
+        now = time.time()
+
+        # Fast path: token already verified and not yet expired
+        with _token_cache_lock:
+            cached = _token_cache.get(cache_key)
+        if cached:
+            user_pk, expiry = cached
+            if now < expiry:
+                try:
+                    return User.objects.get(pk=user_pk)
+                except User.DoesNotExist:
+                    # User was removed since caching; fall through to re-verify
+                    pass
+            with _token_cache_lock:
+                _token_cache.pop(cache_key, None)
+
         try:
             # Verify the token with Google
             # clock_skew allows for some server time differences
             id_info = id_token.verify_oauth2_token(
-                token, 
-                requests.Request(), 
+                token,
+                _GOOGLE_TRANSPORT,
                 GOOGLE_CLIENT_ID,
                 clock_skew_in_seconds=10
             )
@@ -24,7 +64,7 @@ class GoogleAuthBearer(HttpBearer):
             email = id_info.get('email')
             if not email:
                 return None
-            
+
             # Get or create the user in Django
             # Using email as username is common for OAuth
             user, created = User.objects.get_or_create(
@@ -32,6 +72,18 @@ class GoogleAuthBearer(HttpBearer):
                 defaults={'email': email, 'first_name': id_info.get('given_name', ''), 'last_name': id_info.get('family_name', '')}
             )
 
+            # Cache until the token expires or the TTL elapses, whichever
+            # comes first. Evict expired entries if the cache is full.
+            expiry = min(float(id_info.get('exp', now + _TOKEN_CACHE_TTL)), now + _TOKEN_CACHE_TTL)
+            with _token_cache_lock:
+                if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                    expired = [k for k, (_, exp) in _token_cache.items() if exp <= now]
+                    for k in expired:
+                        del _token_cache[k]
+                    if len(_token_cache) >= _TOKEN_CACHE_MAX:
+                        _token_cache.clear()
+                _token_cache[cache_key] = (user.pk, expiry)
+
             return user
         except ValueError as e:
             # Invalid token
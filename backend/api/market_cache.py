@@ -0,0 +1,81 @@
+# File: api/market_cache.py
+"""
+File-based TTL cache for market data.
+
+yfinance downloads dominate wall-clock time for a risk calculation and
+Yahoo rate-limits aggressive clients, so results are persisted as pickles
+under backend/.cache with a JSON sidecar recording when they were
+fetched. Warm hits survive process restarts (dev autoreload, worker
+recycling), unlike the in-memory caches layered on top of this.
+
+Example:
+    >>> from api.market_cache import market_cache, ttl_for_period
+    >>> cached = market_cache.get('history|AAPL,MSFT|1Y', ttl_for_period('1Y'))
+"""
+
+import hashlib
+import json
+import pickle
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache'
+
+# Short windows move with intraday prices; long windows barely change
+# day to day, so they can stay cached for a full session
+SHORT_PERIOD_TTL = 4 * 3600
+LONG_PERIOD_TTL = 24 * 3600
+_SHORT_PERIODS = {'1M', '3M', '1mo', '3mo', '1d', '5d'}
+
+
+def ttl_for_period(period: str) -> int:
+    """TTL in seconds appropriate for a history period."""
+    return SHORT_PERIOD_TTL if period in _SHORT_PERIODS else LONG_PERIOD_TTL
+
+
+class FileCache:
+    """
+    Pickle-per-key cache directory with TTL checked at read time.
+
+    All failures (missing files, corrupt pickles, full disk) degrade to a
+    cache miss or a skipped write — the cache is strictly best-effort and
+    never breaks the fetch path it shields.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR):
+        self.directory = Path(directory)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            pass
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        base = self.directory / digest
+        return base.with_suffix('.pkl'), base.with_suffix('.json')
+
+    def get(self, key: str, ttl: int):
+        """Return the cached value for key, or None if absent/stale."""
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            if time.time() - meta['fetched_at'] >= ttl:
+                return None
+            with data_path.open('rb') as fh:
+                return pickle.load(fh)
+        except (OSError, ValueError, KeyError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def set(self, key: str, value) -> None:
+        """Persist value for key; silently skipped on I/O errors."""
+        data_path, meta_path = self._paths(key)
+        try:
+            with data_path.open('wb') as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            meta_path.write_text(json.dumps({'key': key, 'fetched_at': time.time()}))
+        except OSError:
+            pass
+
+
+# Shared instance used by the fetch paths in risk_engine
+market_cache = FileCache()
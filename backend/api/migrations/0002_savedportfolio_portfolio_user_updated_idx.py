@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-31 14:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='savedportfolio',
+            index=models.Index(fields=['user', '-updated_at'], name='portfolio_user_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-31 14:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_savedportfolio_portfolio_user_updated_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='savedportfolio',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='unique_portfolio_per_user'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def add_positions_gin_index(apps, schema_editor):
+    # GIN indexes are PostgreSQL-only; the SQLite dev/test database keeps
+    # its sequential scan (tables there are small anyway). jsonb_path_ops
+    # serves containment queries like
+    # filter(positions__contains=[{'ticker': 'AAPL'}]).
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS sp_positions_gin '
+        'ON api_savedportfolio USING gin (positions jsonb_path_ops)'
+    )
+
+
+def drop_positions_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS sp_positions_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_savedportfolio_unique_portfolio_per_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_positions_gin_index, drop_positions_gin_index),
+    ]
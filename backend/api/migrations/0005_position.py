@@ -0,0 +1,24 @@
+# Generated by Django 5.2.17 on 2026-08-31 14:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_savedportfolio_positions_gin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Position',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticker', models.CharField(db_index=True, max_length=16)),
+                ('quantity', models.FloatField(default=0)),
+                ('asset_class', models.CharField(blank=True, default='', max_length=16)),
+                ('portfolio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='position_rows', to='api.savedportfolio')),
+            ],
+        ),
+    ]
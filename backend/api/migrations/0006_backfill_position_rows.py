@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+def backfill_position_rows(apps, schema_editor):
+    SavedPortfolio = apps.get_model('api', 'SavedPortfolio')
+    Position = apps.get_model('api', 'Position')
+    rows = []
+    for portfolio in SavedPortfolio.objects.all().iterator(chunk_size=500):
+        for pos in (portfolio.positions or []):
+            if not isinstance(pos, dict):
+                continue
+            rows.append(Position(
+                portfolio=portfolio,
+                ticker=pos.get('ticker', ''),
+                quantity=pos.get('quantity') or 0.0,
+                asset_class=pos.get('asset_class', '') or '',
+            ))
+        if len(rows) >= 1000:
+            Position.objects.bulk_create(rows)
+            rows = []
+    if rows:
+        Position.objects.bulk_create(rows)
+
+
+def drop_position_rows(apps, schema_editor):
+    Position = apps.get_model('api', 'Position')
+    Position.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_position'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_position_rows, drop_position_rows),
+    ]
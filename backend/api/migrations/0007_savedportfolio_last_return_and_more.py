@@ -0,0 +1,33 @@
+# Generated by Django 5.2.17 on 2026-08-31 14:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_backfill_position_rows'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='savedportfolio',
+            name='last_return',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='savedportfolio',
+            name='last_sharpe',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='savedportfolio',
+            name='last_volatility',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='savedportfolio',
+            name='total_value',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
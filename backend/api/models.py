@@ -202,6 +202,17 @@ class AsyncTaskResponse(BaseModel):
 from django.db import models as db_models
 from django.contrib.auth.models import User
 
+class LightPortfolioManager(db_models.Manager):
+    """
+    Default manager deferring the wide columns (positions JSON and
+    description text), so incidental querysets and reprs fetch slim rows.
+    Detail paths that need everything use `SavedPortfolio.full`, and
+    explicit .only()/.values() projections override the deferral.
+    """
+    def get_queryset(self):
+        return super().get_queryset().defer('positions', 'description')
+
+
 class SavedPortfolio(db_models.Model):
     user = db_models.ForeignKey(User, on_delete=db_models.CASCADE, related_name='portfolios')
     name = db_models.CharField(max_length=255)
@@ -212,5 +223,63 @@ class SavedPortfolio(db_models.Model):
     # Store positions as JSON
     positions = db_models.JSONField(default=list)
 
+    # Denormalized analytics captured at save time (from the client's
+    # last /analyze run), so dashboard listings render value/vol/Sharpe
+    # from a single SELECT instead of recomputing per portfolio
+    total_value = db_models.FloatField(null=True, blank=True)
+    last_return = db_models.FloatField(null=True, blank=True)
+    last_volatility = db_models.FloatField(null=True, blank=True)
+    last_sharpe = db_models.FloatField(null=True, blank=True)
+
+    objects = LightPortfolioManager()
+    full = db_models.Manager()
+
+    class Meta:
+        indexes = [
+            # Dashboard listings filter by user and sort newest-first
+            db_models.Index(fields=['user', '-updated_at'], name='portfolio_user_updated_idx'),
+        ]
+        constraints = [
+            # One portfolio per name per user; lets saves upsert via
+            # INSERT ... ON CONFLICT instead of SELECT-then-INSERT
+            db_models.UniqueConstraint(fields=['user', 'name'], name='unique_portfolio_per_user'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.name}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.sync_position_rows()
+
+    def sync_position_rows(self):
+        """Rebuild the normalized Position rows from the positions JSON."""
+        self.position_rows.all().delete()
+        Position.objects.bulk_create([
+            Position(
+                portfolio=self,
+                ticker=pos.get('ticker', ''),
+                quantity=pos.get('quantity') or 0.0,
+                asset_class=pos.get('asset_class', '') or '',
+            )
+            for pos in (self.positions or [])
+            if isinstance(pos, dict)
+        ])
+
+
+class Position(db_models.Model):
+    """
+    Normalized position row, kept in sync with SavedPortfolio.positions.
+
+    The JSON column remains the payload the API serves verbatim; these
+    rows exist so per-ticker queries and aggregations hit real indexed
+    columns instead of deserializing every portfolio's JSON blob.
+    """
+    portfolio = db_models.ForeignKey(SavedPortfolio, on_delete=db_models.CASCADE,
+                                     related_name='position_rows')
+    ticker = db_models.CharField(max_length=16, db_index=True)
+    quantity = db_models.FloatField(default=0)
+    asset_class = db_models.CharField(max_length=16, blank=True, default='')
+
+    def __str__(self):
+        return f"{self.portfolio_id}:{self.ticker} x{self.quantity}"
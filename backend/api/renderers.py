@@ -0,0 +1,25 @@
+# File: api/renderers.py
+"""
+Fast JSON rendering for API responses.
+
+Ninja's default renderer serializes through Python's json module, which is
+slow for responses dominated by arrays of floats (Monte Carlo simulations,
+efficient frontier points, correlation matrices). This renderer serializes
+Pydantic models straight to bytes via pydantic-core's Rust serializer and
+everything else via orjson, which also understands numpy scalars/arrays
+and datetimes natively.
+"""
+
+import orjson
+from ninja.renderers import BaseRenderer
+from pydantic import BaseModel
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+
+    def render(self, request, data, *, response_status):
+        if isinstance(data, BaseModel):
+            # Rust-core serializer: model -> bytes with no dict intermediate
+            return type(data).__pydantic_serializer__.to_json(data)
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
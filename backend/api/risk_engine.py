@@ -1,11 +1,133 @@
 # File: api/risk_engine.py
+import hashlib
+import operator
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 import yfinance as yf
 from typing import Optional
 from scipy import stats
+from scipy.linalg import blas
+from api.market_cache import market_cache, ttl_for_period
 from api.models import Portfolio, Scenario, RiskOutput, ExplanationOutput, RiskDriver
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _drawdown_kernel(returns):
+        """
+        Fused single-pass drawdown computation.
+
+        Wealth index, running peak, drawdown series, max drawdown and the
+        indices of the trough and its preceding peak all come out of one
+        loop with scalar accumulators, instead of four separate pandas
+        passes (cumprod, expanding max, elementwise drawdown, idxmin)
+        each allocating and re-scanning a full Series.
+        """
+        n = returns.shape[0]
+        cum = np.empty(n)
+        dd = np.empty(n)
+        wealth = 1.0
+        peak = 0.0
+        cur_peak_idx = 0
+        max_dd = 0.0
+        max_dd_idx = 0
+        peak_idx = 0
+        for i in range(n):
+            wealth *= 1.0 + returns[i]
+            cum[i] = wealth
+            if wealth > peak:
+                peak = wealth
+                cur_peak_idx = i
+            d = (wealth - peak) / peak
+            dd[i] = d
+            if d < max_dd:
+                max_dd = d
+                max_dd_idx = i
+                peak_idx = cur_peak_idx
+        return cum, dd, max_dd, max_dd_idx, peak_idx
+
+    @njit(cache=True)
+    def _recovery_scan(cum, start_idx, peak_value):
+        """First index at or after start_idx where wealth regains the peak."""
+        for i in range(start_idx, cum.shape[0]):
+            if cum[i] >= peak_value:
+                return i
+        return -1
+else:
+    def _drawdown_kernel(returns):
+        """NumPy fallback computing the same quantities in a few passes."""
+        cum = np.cumprod(1.0 + returns)
+        peaks = np.maximum.accumulate(cum)
+        dd = (cum - peaks) / peaks
+        max_dd_idx = int(dd.argmin())
+        max_dd = float(dd[max_dd_idx])
+        peak_idx = int(cum[:max_dd_idx + 1].argmax())
+        return cum, dd, max_dd, max_dd_idx, peak_idx
+
+    def _recovery_scan(cum, start_idx, peak_value):
+        hits = np.nonzero(cum[start_idx:] >= peak_value)[0]
+        return int(start_idx + hits[0]) if hits.size else -1
+
+
+# User-friendly period labels to yfinance period strings, shared by the
+# history and benchmark fetchers
+_PERIOD_MAP = {
+    '1M': '1mo',
+    '3M': '3mo',
+    '6M': '6mo',
+    '1Y': '1y',
+    '3Y': '3y',
+    '5Y': '5y',
+    'YTD': 'ytd',
+    'MAX': 'max'
+}
+
+# Sector/country/industry are effectively static, so .info lookups are
+# memoized twice: an in-process dict for local hits and the file cache
+# for a week across restarts. Failures are never cached, so transient
+# errors are retried on the next call.
+_INFO_CACHE_TTL = 7 * 24 * 3600
+_info_cache: dict = {}
+_info_cache_lock = threading.Lock()
+
+
+def _fetch_info(ticker: str, handle=None) -> dict:
+    """
+    Metadata for one ticker; raises if the yfinance lookup fails.
+
+    When a pre-built yf.Ticker handle is supplied (from a yf.Tickers
+    batch), the lookup reuses its shared HTTP session instead of opening
+    a fresh connection per symbol.
+    """
+    with _info_cache_lock:
+        hit = _info_cache.get(ticker)
+    if hit is not None:
+        return hit
+
+    result = market_cache.get(f'info|{ticker}', _INFO_CACHE_TTL)
+    if result is None:
+        # yfinance info property makes a network call
+        info = (handle if handle is not None else yf.Ticker(ticker)).info
+        result = {
+            'sector': info.get('sector', 'Other'),
+            'country': info.get('country', 'Other'),
+            'industry': info.get('industry', 'Other')
+        }
+        market_cache.set(f'info|{ticker}', result)
+    with _info_cache_lock:
+        _info_cache[ticker] = result
+    return result
+
 
 class MarketData:
     """
@@ -17,18 +139,27 @@ class MarketData:
         >>> print(data.keys())  # dict_keys(['returns', 'cov_matrix', 'mean_returns', 'current_prices'])
     """
     
-    # Period mapping for user-friendly periods
-    PERIOD_MAP = {
-        '1M': '1mo',
-        '3M': '3mo',
-        '6M': '6mo',
-        '1Y': '1y',
-        '3Y': '3y',
-        '5Y': '5y',
-        'YTD': 'ytd',
-        'MAX': 'max'
-    }
-    
+    # Period mapping for user-friendly periods (shared module constant)
+    PERIOD_MAP = _PERIOD_MAP
+
+    # Process-wide response cache shared by all instances, keyed on
+    # (sorted tickers, period). Repeated analyses of the same portfolio
+    # within the TTL skip the yfinance round-trip entirely. Bounded:
+    # entries pin full returns frames and keys span arbitrary user
+    # portfolios, so the cache is cleared when it fills rather than
+    # growing without limit.
+    _HISTORY_CACHE_TTL = 300  # seconds
+    _HISTORY_CACHE_MAX = 32
+    _history_cache: dict = {}
+    _history_cache_lock = threading.Lock()
+
+    @classmethod
+    def _history_cache_put(cls, cache_key, now, value):
+        with cls._history_cache_lock:
+            if len(cls._history_cache) >= cls._HISTORY_CACHE_MAX:
+                cls._history_cache.clear()
+            cls._history_cache[cache_key] = (now, value)
+
     def fetch_history(self, tickers: list[str], period: str = '1Y') -> dict:
         """
         Fetch historical price data and compute returns/covariance.
@@ -50,10 +181,26 @@ class MarketData:
         """
         if not tickers:
             raise ValueError("Ticker list cannot be empty")
-        
+
+        # Serve from the shared cache when fresh
+        cache_key = (tuple(sorted(tickers)), period)
+        now = time.monotonic()
+        with self._history_cache_lock:
+            cached = self._history_cache.get(cache_key)
+        if cached and now - cached[0] < self._HISTORY_CACHE_TTL:
+            return dict(cached[1])
+
+        # Disk cache next: survives process restarts and shields Yahoo
+        # rate limits across workers
+        disk_key = f"history|{','.join(sorted(tickers))}|{period}"
+        disk_hit = market_cache.get(disk_key, ttl_for_period(period))
+        if disk_hit is not None:
+            self._history_cache_put(cache_key, now, disk_hit)
+            return dict(disk_hit)
+
         # Convert user-friendly period to yfinance format
         yf_period = self.PERIOD_MAP.get(period, period)
-        
+
         # Download adjusted close prices
         try:
             df = yf.download(
@@ -77,7 +224,7 @@ class MarketData:
             raise ValueError(f"No valid data retrieved for tickers: {tickers}")
         
         # Forward fill missing values
-        df = df.fillna(method='ffill').dropna()
+        df = df.ffill().dropna()
         
         if df.empty:
             raise ValueError("Insufficient data after cleaning")
@@ -87,76 +234,115 @@ class MarketData:
         
         # Calculate daily returns
         returns = df.pct_change().dropna()
-        
-        # Compute covariance matrix (annualized: 252 trading days)
-        cov_matrix = returns.cov() * 252
-        
-        # Compute mean returns (annualized)
-        mean_returns = returns.mean() * 252
-        
-        return {
+
+        # Plain-ndarray views alongside the labeled objects: the hot path
+        # in calculate_risk works on these (no label alignment, row-major
+        # contiguous), with ticker_index mapping symbols to columns.
+        # T >> N here, so the row-major layout keeps the T-wise reductions
+        # and the returns @ weights matvec streaming over contiguous rows.
+        returns_arr = np.ascontiguousarray(returns.to_numpy(dtype=np.float64))
+        n_obs = returns_arr.shape[0]
+
+        # Covariance via the cross-product identity cov = (X'X - n*m*m')/(n-1)
+        # on the contiguous array: one symmetric BLAS kernel, no centered
+        # copy and no second pass, versus pandas .cov(). Annualized by 252.
+        col_means = returns_arr.mean(axis=0)
+        xtx = blas.dsyrk(1.0, returns_arr, trans=1, lower=0)
+        cov_arr = xtx - n_obs * np.outer(col_means, col_means)
+        il = np.tril_indices_from(cov_arr, -1)
+        cov_arr[il] = cov_arr.T[il]
+        cov_arr *= 252.0 / max(n_obs - 1, 1)
+        mean_arr = col_means * 252.0
+
+        # Labeled views for callers that still want pandas objects
+        cov_matrix = pd.DataFrame(cov_arr, index=returns.columns, columns=returns.columns)
+        mean_returns = pd.Series(mean_arr, index=returns.columns)
+
+        result = {
             'returns': returns,
             'cov_matrix': cov_matrix,
             'mean_returns': mean_returns,
             'current_prices': current_prices,
-            'valid_tickers': list(df.columns)
+            'valid_tickers': list(df.columns),
+            'returns_arr': returns_arr,
+            'cov_arr': cov_arr,
+            'mean_arr': mean_arr,
+            'ticker_index': {t: i for i, t in enumerate(df.columns)}
         }
 
+        self._history_cache_put(cache_key, now, result)
+        market_cache.set(disk_key, result)
+
+        # Shallow copy so callers can add keys without polluting the cache
+        return dict(result)
+
     def get_asset_metadata(self, tickers: list[str]) -> dict:
         """
         Fetch static metadata (Sector, Country) for tickers.
+
+        Lookups are fanned out over a thread pool: each `.info` access is a
+        network round-trip and the GIL is released during I/O, so wall time
+        is one fetch rather than the sum of all of them. The whole batch
+        goes through one yf.Tickers handle whose shared session multiplexes
+        the requests over a single connection pool, and individual lookups
+        are memoized in-process and on disk via _fetch_info.
         """
-        metadata = {}
-        for ticker in tickers:
+        if not tickers:
+            return {}
+
+        batch = yf.Tickers(' '.join(tickers)).tickers
+
+        def fetch_one(ticker: str) -> dict:
             try:
-                # yfinance info property makes a network call
-                # Note: This is slow. In production, use bulk fetch or cache.
-                info = yf.Ticker(ticker).info
-                metadata[ticker] = {
-                    'sector': info.get('sector', 'Other'),
-                    'country': info.get('country', 'Other'),
-                    'industry': info.get('industry', 'Other')
-                }
+                return _fetch_info(ticker, batch.get(ticker.upper()))
             except Exception:
-                metadata[ticker] = {'sector': 'Unknown', 'country': 'Unknown'}
-        return metadata
+                return {'sector': 'Unknown', 'country': 'Unknown'}
+
+        with ThreadPoolExecutor(max_workers=min(16, len(tickers))) as executor:
+            return dict(zip(tickers, executor.map(fetch_one, tickers)))
 
 
 def calculate_performance_metrics(
-    returns: pd.DataFrame,
-    weights: np.ndarray,
+    portfolio_returns: np.ndarray,
     portfolio_return: float,
     portfolio_volatility: float,
     risk_free_rate: float = 0.04
 ) -> dict:
     """
     Calculate risk-adjusted performance metrics.
-    
+
     Args:
-        returns: DataFrame of daily returns
-        weights: Portfolio weights vector
+        portfolio_returns: Daily portfolio return series (precomputed)
         portfolio_return: Annualized portfolio return
         portfolio_volatility: Annualized portfolio volatility
         risk_free_rate: Annual risk-free rate (default: 4%)
-        
+
     Returns:
         dict with sharpe_ratio, sortino_ratio, annualized_return
-        
+
     Example:
-        >>> metrics = calculate_performance_metrics(returns, weights, 0.12, 0.18)
+        >>> metrics = calculate_performance_metrics(port_returns, 0.12, 0.18)
         >>> print(f"Sharpe: {metrics['sharpe_ratio']:.2f}")
     """
     # Sharpe Ratio: (Return - Risk Free Rate) / Volatility
     sharpe_ratio = (portfolio_return - risk_free_rate) / portfolio_volatility if portfolio_volatility > 0 else 0
-    
-    # Calculate portfolio returns for Sortino
-    portfolio_returns = returns.dot(weights)
-    
-    # Sortino Ratio: Uses downside deviation instead of total volatility
-    downside_returns = portfolio_returns[portfolio_returns < 0]
-    if len(downside_returns) > 0:
-        downside_deviation = downside_returns.std() * np.sqrt(252)
+
+    # Sortino Ratio: Uses downside deviation instead of total volatility.
+    # Branchless: clamping with np.minimum leaves the loss sum/sum-of-
+    # squares unchanged (zeros contribute nothing), so the sample std of
+    # the negative returns falls out of three SIMD reductions without
+    # allocating a boolean-indexed copy.
+    portfolio_returns = np.asarray(portfolio_returns)
+    neg = np.minimum(portfolio_returns, 0.0)
+    n_neg = int(np.count_nonzero(neg))
+    if n_neg > 1:
+        loss_sum = neg.sum()
+        loss_sq_sum = float(neg @ neg)
+        downside_var = (loss_sq_sum - loss_sum * loss_sum / n_neg) / (n_neg - 1)
+        downside_deviation = np.sqrt(max(downside_var, 0.0) * 252)
         sortino_ratio = (portfolio_return - risk_free_rate) / downside_deviation if downside_deviation > 0 else 0
+    elif n_neg == 1:
+        sortino_ratio = 0  # sample std undefined for a single loss
     else:
         sortino_ratio = sharpe_ratio  # No downside, use Sharpe
     
@@ -183,19 +369,26 @@ def calculate_correlation_matrix(returns: pd.DataFrame) -> dict:
         >>> print(corr_data['tickers'])
     """
     corr_matrix = returns.corr()
-    
-    # Convert to list of dicts for frontend
-    correlations = []
+
+    # Convert to list of dicts for frontend. One ravel().tolist() pass
+    # unboxes the whole matrix to Python floats; the old nested loop paid
+    # a pandas .iloc dispatch per cell (N^2 label lookups). Only the
+    # upper triangle (j >= i) is emitted — the matrix is symmetric, so
+    # this halves the dict allocations and the JSON payload, and the
+    # heatmap mirrors the pair on lookup.
     tickers = list(corr_matrix.columns)
-    
-    for i, ticker1 in enumerate(tickers):
-        for j, ticker2 in enumerate(tickers):
-            correlations.append({
-                'ticker1': ticker1,
-                'ticker2': ticker2,
-                'correlation': float(corr_matrix.iloc[i, j])
-            })
-    
+    n = len(tickers)
+    values = corr_matrix.to_numpy().ravel().tolist()
+    correlations = [
+        {
+            'ticker1': tickers[i],
+            'ticker2': tickers[j],
+            'correlation': values[i * n + j]
+        }
+        for i in range(n)
+        for j in range(i, n)
+    ]
+
     return {
         'tickers': tickers,
         'correlations': correlations
@@ -204,66 +397,58 @@ def calculate_correlation_matrix(returns: pd.DataFrame) -> dict:
 
 def calculate_drawdown_metrics(
     returns: pd.DataFrame,
-    weights: np.ndarray
+    weights: np.ndarray,
+    portfolio_returns: np.ndarray | None = None
 ) -> dict:
     """
     Calculate maximum drawdown and related metrics.
-    
+
     Args:
         returns: DataFrame of historical returns
         weights: Portfolio weights
-        
+        portfolio_returns: Optional precomputed daily portfolio return
+            array (returns @ weights); avoids repeating the matvec when
+            the caller already has it
+
     Returns:
         Dictionary with drawdown metrics and time series
-        
+
     Example:
         >>> metrics = calculate_drawdown_metrics(returns, weights)
         >>> print(f"Max DD: {metrics['max_drawdown']:.2%}")
     """
-    # Calculate portfolio returns
-    portfolio_returns = returns.dot(weights)
-    
-    # Calculate cumulative returns (wealth index)
-    cumulative_returns = (1 + portfolio_returns).cumprod()
-    
-    # Calculate running maximum
-    running_max = cumulative_returns.expanding().max()
-    
-    # Calculate drawdown series
-    drawdown = (cumulative_returns - running_max) / running_max
-    
-    # Find maximum drawdown
-    max_drawdown = drawdown.min()
-    
-    # Find when max drawdown occurred
-    max_dd_date = drawdown.idxmin()
-    
-    # Calculate current drawdown
-    current_drawdown = drawdown.iloc[-1]
-    
+    # Wealth index, drawdown series, trough and preceding peak in one
+    # fused kernel pass; timestamps are mapped back via the index only
+    # for the handful of dates the output needs
+    if portfolio_returns is None:
+        portfolio_returns = returns.to_numpy() @ weights
+    index = returns.index
+    cum, dd, max_drawdown, max_dd_idx, peak_idx = _drawdown_kernel(portfolio_returns)
+
+    max_dd_date = index[max_dd_idx]
+    current_drawdown = dd[-1]
+
     # Calculate recovery time (days from max DD to recovery)
     recovery_time = 0
     if max_drawdown < 0:
-        # Find the peak before max drawdown
-        peak_before_dd = running_max.loc[:max_dd_date].idxmax()
-        # Find when portfolio recovered (if it did)
-        recovery_dates = cumulative_returns[max_dd_date:][
-            cumulative_returns[max_dd_date:] >= running_max.loc[peak_before_dd]
-        ]
-        if len(recovery_dates) > 0:
-            recovery_date = recovery_dates.index[0]
-            recovery_time = (recovery_date - max_dd_date).days
-    
-    # Prepare drawdown series for visualization (limit to last 252 days)
-    recent_drawdown = drawdown.tail(min(252, len(drawdown)))
+        recovery_idx = _recovery_scan(cum, max_dd_idx, cum[peak_idx])
+        if recovery_idx >= 0:
+            recovery_time = (index[recovery_idx] - max_dd_date).days
+
+    # Prepare drawdown series for visualization (limit to last 252 days).
+    # One vectorized strftime over the index replaces a Python-level
+    # strftime call per row.
+    tail = min(252, len(dd))
+    recent_dd = dd[-tail:].tolist()
+    recent_dates = index[-tail:].strftime('%Y-%m-%d').tolist()
     drawdown_series = [
         {
-            'date': date.strftime('%Y-%m-%d'),
-            'drawdown': float(dd)
+            'date': date,
+            'drawdown': value
         }
-        for date, dd in recent_drawdown.items()
+        for date, value in zip(recent_dates, recent_dd)
     ]
-    
+
     return {
         'max_drawdown': float(max_drawdown),
         'max_drawdown_date': max_dd_date.strftime('%Y-%m-%d') if max_drawdown < 0 else None,
@@ -288,28 +473,32 @@ def fetch_benchmark_data(benchmark_ticker: str = '^GSPC', period: str = '1Y') ->
         >>> benchmark = fetch_benchmark_data('^GSPC', '3M')
         >>> print(benchmark['annualized_return'])
     """
-    # Period mapping
-    PERIOD_MAP = {
-        '1M': '1mo', '3M': '3mo', '6M': '6mo', '1Y': '1y',
-        '3Y': '3y', '5Y': '5y', 'YTD': 'ytd', 'MAX': 'max'
-    }
-    yf_period = PERIOD_MAP.get(period, period)
-    
+    yf_period = _PERIOD_MAP.get(period, period)
+
+    # Every risk calculation fetches the same benchmark for its period, so
+    # the disk cache turns all but the first into a local read
+    disk_key = f"benchmark|{benchmark_ticker}|{period}"
+    cached = market_cache.get(disk_key, ttl_for_period(period))
+    if cached is not None:
+        return dict(cached)
+
     try:
         df = yf.download(benchmark_ticker, period=yf_period, progress=False, auto_adjust=True)['Close']
         returns = df.pct_change().dropna()
-        
+
         annualized_return = returns.mean() * 252
         annualized_volatility = returns.std() * np.sqrt(252)
         sharpe_ratio = (annualized_return - 0.04) / annualized_volatility if annualized_volatility > 0 else 0
-        
-        return {
+
+        result = {
             'ticker': benchmark_ticker,
             'annualized_return': float(annualized_return),
             'annualized_volatility': float(annualized_volatility),
             'sharpe_ratio': float(sharpe_ratio),
             'returns': returns
         }
+        market_cache.set(disk_key, result)
+        return result
     except Exception as e:
         # Return None if benchmark fetch fails (don't break main analysis)
         return None
@@ -363,6 +552,29 @@ def calculate_alpha_beta(
     }
 
 
+# Full-result cache: a dashboard refresh re-sends the identical
+# portfolio seconds after the last analysis, so the whole pipeline
+# output is kept for a few minutes keyed on what determines it —
+# positions, period and scenario. Stored as model_dump() dicts and
+# re-validated on the way out so cached results are never aliased
+# between callers. Same bounded dict-plus-lock pattern as the other
+# caches in this module.
+_RISK_RESULT_TTL = 300  # seconds
+_RISK_RESULT_MAX = 256
+_risk_result_cache: dict = {}
+_risk_result_lock = threading.Lock()
+
+
+def _risk_result_key(portfolio: Portfolio, scenario: Optional[Scenario], period: str) -> str:
+    """Digest of everything that determines a calculate_risk result."""
+    signature = (
+        tuple(sorted((p.ticker, p.quantity) for p in portfolio.positions)),
+        period,
+        (scenario.name, tuple(sorted(scenario.factor_shocks.items()))) if scenario else None
+    )
+    return hashlib.blake2b(repr(signature).encode(), digest_size=16).hexdigest()
+
+
 class RiskCalculator:
     """
     Performs vectorized portfolio risk calculations.
@@ -404,84 +616,132 @@ class RiskCalculator:
             >>> result = calc.calculate_risk(portfolio, period='3M')
             >>> print(f"Portfolio VaR: ${result.var_95:,.2f}")
         """
-        # Extract tickers
-        tickers = [pos.ticker for pos in portfolio.positions]
-        
-        # Fetch market data with specified period
+        # Serve identical repeat requests (same positions, period and
+        # scenario — the common dashboard-refresh case) straight from the
+        # result cache, skipping network, covariance and simulation work.
+        cache_key = _risk_result_key(portfolio, scenario, period)
+        now = time.monotonic()
+        if benchmark_data is None and sector_data is None:
+            with _risk_result_lock:
+                cached = _risk_result_cache.get(cache_key)
+            if cached and now - cached[0] < _RISK_RESULT_TTL:
+                return RiskOutput.model_validate(cached[1])
+
+        # Extract tickers via a single C-level attrgetter pass
+        tickers = list(map(operator.attrgetter('ticker'), portfolio.positions))
+
+        # Fetch market data with specified period. Unless the caller
+        # already supplied benchmark data, issue the benchmark download in
+        # parallel with the portfolio history: both are independent
+        # network round-trips on the critical path.
         try:
-            market_data = self.market_data.fetch_history(tickers, period=period)
+            if benchmark_data is None:
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    history_future = pool.submit(self.market_data.fetch_history, tickers, period)
+                    benchmark_future = pool.submit(fetch_benchmark_data, '^GSPC', period)
+                    market_data = history_future.result()
+                    benchmark_data = benchmark_future.result()
+            else:
+                market_data = self.market_data.fetch_history(tickers, period=period)
         except ValueError as e:
             raise ValueError(f"Market data error: {str(e)}")
         
-        valid_tickers = market_data['valid_tickers']
         current_prices = market_data['current_prices']
-        cov_matrix = market_data['cov_matrix']
-        mean_returns = market_data['mean_returns']
-        
+        cov_arr = market_data['cov_arr']
+        mean_arr = market_data['mean_arr']
+        returns_arr = market_data['returns_arr']
+        ticker_index = market_data['ticker_index']
+
         # Filter positions to only valid tickers
         valid_positions = [
             pos for pos in portfolio.positions
-            if pos.ticker in valid_tickers
+            if pos.ticker in ticker_index
         ]
-        
+
         if not valid_positions:
             raise ValueError("No valid positions after market data filtering")
-        
+
+        # Pull (ticker, quantity) pairs out of the pydantic models once;
+        # everything below works on these plain tuples and the covariance
+        # column indices instead of repeated attribute access
+        pos_tickers, pos_quantities = zip(*map(operator.attrgetter('ticker', 'quantity'), valid_positions))
+        pos_idx = [ticker_index[t] for t in pos_tickers]
+
         # Calculate position values
         position_values = np.array([
-            pos.quantity * current_prices[pos.ticker]
-            for pos in valid_positions
+            q * current_prices[t]
+            for t, q in zip(pos_tickers, pos_quantities)
         ])
-        
+
         total_value = position_values.sum()
-        
+
         # Calculate weights
         weights = position_values / total_value
-        
-        # Apply scenario shocks if provided
+
+        # Apply scenario shocks if provided: scatter them into a dense
+        # shock vector and add in one vectorized op. The add allocates the
+        # adjusted copy, so the cached mean array is never mutated.
         if scenario and scenario.factor_shocks:
-            adjusted_returns = mean_returns.copy()
+            shock_vec = np.zeros(mean_arr.shape[0])
             for ticker, shock in scenario.factor_shocks.items():
-                if ticker in adjusted_returns.index:
-                    adjusted_returns[ticker] += shock
-            mean_returns = adjusted_returns
-        
-        # Align weights with covariance matrix
-        weights_vector = np.array([weights[i] for i, pos in enumerate(valid_positions)])
-        
+                idx = ticker_index.get(ticker)
+                if idx is not None:
+                    shock_vec[idx] = shock
+            mean_arr = mean_arr + shock_vec
+
+        # Scatter position weights into covariance column order via the
+        # precomputed column indices, so every matrix op below is plain
+        # ndarray arithmetic with guaranteed alignment (add.at accumulates
+        # correctly if a ticker appears in several positions)
+        weights_vector = np.zeros(len(ticker_index))
+        np.add.at(weights_vector, pos_idx, weights)
+
         # Portfolio volatility: σ_p = sqrt(W^T * Σ * W)
-        portfolio_variance = np.dot(weights_vector, np.dot(cov_matrix.values, weights_vector))
+        portfolio_variance = weights_vector @ cov_arr @ weights_vector
         portfolio_volatility = np.sqrt(portfolio_variance)
-        
+
         # Marginal contribution to risk: MCR = (Σ * W) / σ_p
-        marginal_risk = np.dot(cov_matrix.values, weights_vector) / portfolio_volatility
-        
+        marginal_risk = (cov_arr @ weights_vector) / portfolio_volatility
+
         # Component risk (Euler decomposition): CR = W * MCR
         component_risk = weights_vector * marginal_risk
-        
+
         # Normalize to percentages
         risk_contributions = (component_risk / component_risk.sum()) * 100
-        
+
         # Value at Risk (95% confidence, 1-day, parametric)
         # VaR = μ - z * σ, where z = 1.645 for 95% confidence
         z_score = stats.norm.ppf(0.05)  # -1.645
-        portfolio_return = np.dot(weights_vector, mean_returns.values)
+        portfolio_return = float(weights_vector @ mean_arr)
         daily_volatility = portfolio_volatility / np.sqrt(252)
         var_95 = abs(total_value * (z_score * daily_volatility - portfolio_return / 252))
-        
-        # Build position-level breakdown
-        positions_breakdown = []
-        for i, pos in enumerate(valid_positions):
-            positions_breakdown.append({
-                'ticker': pos.ticker,
-                'quantity': pos.quantity,
-                'current_price': current_prices[pos.ticker],
-                'value': position_values[i],
-                'weight': float(weights[i]),
-                'volatility': float(np.sqrt(cov_matrix.loc[pos.ticker, pos.ticker])),
-                'risk_contribution_pct': float(risk_contributions[i]),
-                'marginal_risk': float(marginal_risk[i])
-            })
+
+        # Build position-level breakdown. Gather each position's metrics
+        # with one fancy-index per array and unbox to Python floats in
+        # single tolist() passes, so the dict construction below is pure
+        # zip iteration with no per-field numpy-scalar boxing.
+        asset_vols = np.sqrt(np.diag(cov_arr))
+        positions_breakdown = [
+            {
+                'ticker': ticker,
+                'quantity': quantity,
+                'current_price': current_prices[ticker],
+                'value': value,
+                'weight': weight,
+                'volatility': vol,
+                'risk_contribution_pct': contribution,
+                'marginal_risk': marginal
+            }
+            for ticker, quantity, value, weight, vol, contribution, marginal in zip(
+                pos_tickers,
+                pos_quantities,
+                position_values.tolist(),
+                weights.tolist(),
+                asset_vols[pos_idx].tolist(),
+                risk_contributions[pos_idx].tolist(),
+                marginal_risk[pos_idx].tolist()
+            )
+        ]
         
         # Generate explanation
         explanation = self._generate_explanation(
@@ -491,10 +751,13 @@ class RiskCalculator:
             var_95
         )
         
+        # Daily portfolio return series, computed once and reused by the
+        # performance, benchmark and drawdown calculations
+        portfolio_returns_arr = returns_arr @ weights_vector
+
         # Calculate performance metrics
         performance_metrics = calculate_performance_metrics(
-            returns=market_data['returns'],
-            weights=weights_vector,
+            portfolio_returns=portfolio_returns_arr,
             portfolio_return=portfolio_return,
             portfolio_volatility=portfolio_volatility
         )
@@ -505,17 +768,18 @@ class RiskCalculator:
         # Calculate drawdown metrics
         drawdown_metrics = calculate_drawdown_metrics(
             returns=market_data['returns'],
-            weights=weights_vector
+            weights=weights_vector,
+            portfolio_returns=portfolio_returns_arr
         )
         
-        # Calculate benchmark comparison
-        benchmark_data = fetch_benchmark_data('^GSPC', period=period)
+        # Calculate benchmark comparison (fetched above, in parallel with
+        # the portfolio history, or passed in by the caller)
         benchmark_comparison = None
         
         if benchmark_data:
-            # Calculate portfolio returns for alpha/beta
-            portfolio_returns = market_data['returns'].dot(weights_vector)
-            
+            # Label the precomputed daily series for date alignment only
+            portfolio_returns = pd.Series(portfolio_returns_arr, index=market_data['returns'].index)
+
             alpha_beta = calculate_alpha_beta(
                 portfolio_returns=portfolio_returns,
                 benchmark_returns=benchmark_data['returns'],
@@ -533,7 +797,9 @@ class RiskCalculator:
                 'correlation': alpha_beta['correlation']
             }
         
-        # Calculate Monte Carlo VaR
+        # Calculate Monte Carlo VaR, reusing the covariance and means already
+        # computed by fetch_history (de-annualized back to daily) instead of
+        # letting monte_carlo_var re-run returns.cov()
         from api.monte_carlo import monte_carlo_var
         mc_var_result = monte_carlo_var(
             returns=market_data['returns'],
@@ -541,10 +807,12 @@ class RiskCalculator:
             portfolio_value=total_value,
             num_simulations=10000,
             time_horizon=1,
-            confidence_level=0.95
+            confidence_level=0.95,
+            cov=cov_arr / 252.0,
+            mean=mean_arr / 252.0
         )
         
-        return RiskOutput(
+        result = RiskOutput(
             total_value=float(total_value),
             volatility_annualized=float(portfolio_volatility),
             var_95=float(var_95),
@@ -556,7 +824,14 @@ class RiskCalculator:
             monte_carlo=mc_var_result,
             drawdown=drawdown_metrics
         )
-    
+
+        with _risk_result_lock:
+            if len(_risk_result_cache) >= _RISK_RESULT_MAX:
+                _risk_result_cache.clear()
+            _risk_result_cache[cache_key] = (now, result.model_dump())
+
+        return result
+
     def _generate_explanation(
         self,
         volatility: float,
@@ -653,33 +928,6 @@ class RiskCalculator:
             'portfolio': portfolio_values,
             'benchmark': benchmark_values
         }
-        """
-        Calculate cumulative growth of a hypothetical $10,000 investment.
-        """
-        if returns.empty or benchmark_returns.empty:
-            return None
-            
-        # Align dates
-        aligned = pd.concat([returns, benchmark_returns], axis=1, join='inner').dropna()
-        aligned.columns = ['portfolio', 'benchmark']
-        
-        if aligned.empty:
-            return None
-        
-        # Calculate cumulative returns starting at 10,000
-        portfolio_cum = (1 + aligned['portfolio']).cumprod() * 10000
-        benchmark_cum = (1 + aligned['benchmark']).cumprod() * 10000
-        
-        # Prepend starting value
-        dates = aligned.index.strftime('%Y-%m-%d').tolist()
-        portfolio_values = portfolio_cum.tolist()
-        benchmark_values = benchmark_cum.tolist()
-        
-        return {
-            'dates': dates,
-            'portfolio': portfolio_values,
-            'benchmark': benchmark_values
-        }
 
     def fetch_sector_data(self, tickers: list[str]) -> dict:
         """
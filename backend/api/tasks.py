@@ -1,47 +1,98 @@
 # File: api/tasks.py
+import requests
 from celery import shared_task
-from api.models import Portfolio, Scenario, RiskOutput
-from api.risk_engine import RiskCalculator
-import json
+from celery.signals import worker_process_init
+from api.models import Portfolio, Scenario
+
+# One calculator per worker process: constructed at worker boot (or
+# lazily on first task), then shared by every task on that process so
+# warm HTTP sessions and in-process caches persist across invocations.
+# The risk engine (and its pandas/numpy/yfinance imports) is loaded
+# lazily: processes that only enqueue tasks never pay that import cost.
+_CALCULATOR = None
+
+
+def _get_calculator():
+    global _CALCULATOR
+    if _CALCULATOR is None:
+        from api.risk_engine import RiskCalculator
+        _CALCULATOR = RiskCalculator()
+    return _CALCULATOR
+
+
+def _warm_jit_kernels():
+    """
+    Compile the numba kernels once at boot with tiny synthetic inputs.
+
+    First-call JIT compilation would otherwise land on the first real
+    task after a worker restart; cache=True on the kernels persists the
+    compiled code on disk, so this is near-instant on later boots.
+    Best-effort: a failure here only means the first task compiles.
+    """
+    try:
+        import numpy as np
+        from api import monte_carlo, risk_engine
+        cum, _, _, _, peak_idx = risk_engine._drawdown_kernel(np.zeros(4))
+        risk_engine._recovery_scan(cum, 0, float(cum[peak_idx]))
+        monte_carlo._fill_portfolio_values(np.empty(4), 0.0, 0.01, 1.0)
+    except Exception:
+        pass
+
+
+@worker_process_init.connect
+def _init_calculator(**kwargs):
+    _get_calculator()
+    _warm_jit_kernels()
 
 
 @shared_task(bind=True, max_retries=3)
-def calculate_risk_async(self, portfolio_json: str, scenario_json: str | None = None) -> dict:
+def calculate_risk_async(self, portfolio_data: dict, scenario_data: dict | None = None) -> dict:
     """
     Asynchronous task for calculating portfolio risk metrics.
-    
+
     Args:
         self: Celery task instance (bound)
-        portfolio_json: JSON string of Portfolio object
-        scenario_json: Optional JSON string of Scenario object
-        
+        portfolio_data: dict representation of a Portfolio
+        scenario_data: Optional dict representation of a Scenario
+
     Returns:
         Dictionary representation of RiskOutput
-        
+
     Example:
         >>> from api.tasks import calculate_risk_async
-        >>> portfolio_data = '{"positions": [{"ticker": "AAPL", "quantity": 100, "asset_class": "Equity"}]}'
+        >>> portfolio_data = {"positions": [{"ticker": "AAPL", "quantity": 100, "asset_class": "Equity"}]}
         >>> result = calculate_risk_async.delay(portfolio_data, None)
         >>> print(result.task_id)
     """
+    # Local import keeps yfinance out of enqueue-only processes; the
+    # module cache makes this free after the first task
+    from yfinance.exceptions import YFRateLimitError
+
     try:
-        # Deserialize portfolio
-        portfolio_dict = json.loads(portfolio_json)
-        portfolio = Portfolio(**portfolio_dict)
-        
-        # Deserialize scenario if provided
+        # Reconstruct models straight from the dicts Celery already decoded
+        portfolio = Portfolio.model_validate(portfolio_data)
+
         scenario = None
-        if scenario_json:
-            scenario_dict = json.loads(scenario_json)
-            scenario = Scenario(**scenario_dict)
+        if scenario_data:
+            # The API layer validated this payload before enqueueing, so
+            # skip pydantic's per-key re-validation of factor_shocks
+            # (Scenario is flat, making model_construct safe here)
+            scenario = Scenario.model_construct(
+                name=scenario_data.get('name', ''),
+                factor_shocks=scenario_data.get('factor_shocks', {})
+            )
         
-        # Calculate risk
-        calculator = RiskCalculator()
+        # Calculate risk with the process-wide calculator
+        calculator = _get_calculator()
         risk_output = calculator.calculate_risk(portfolio, scenario)
         
-        # Convert to dict for JSON serialization
-        return risk_output.model_dump()
+        # Convert to JSON-ready dict in one pydantic-core pass, so the
+        # Celery result serializer never hits a non-JSON type
+        return risk_output.model_dump(mode='json')
         
-    except Exception as exc:
-        # Retry on failure
-        raise self.retry(exc=exc, countdown=60)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, YFRateLimitError) as exc:
+        # Only transient network trouble is worth retrying, with
+        # exponential backoff so an upstream outage isn't hammered.
+        # Deterministic failures (bad tickers -> ValueError, malformed
+        # payloads -> ValidationError) propagate and fail immediately.
+        raise self.retry(exc=exc, countdown=60 * 2 ** self.request.retries)
@@ -1,17 +1,65 @@
-from django.test import TestCase, Client
+from django.test import TestCase
 from django.contrib.auth.models import User
 from unittest.mock import patch
-from api.models import SavedPortfolio
+from api.models import ExplanationOutput, Position, RiskOutput, SavedPortfolio
 import json
 
+
+class AnalyzeFastTests(TestCase):
+    def test_analyze_fast_reads_portfolio_from_body(self):
+        """
+        The fast path must bind the portfolio dict from the JSON body
+        (a bare dict parameter would be treated as a query param).
+        """
+        stub = RiskOutput(
+            total_value=1000.0,
+            volatility_annualized=0.2,
+            var_95=50.0,
+            positions=[],
+            explanation=ExplanationOutput(summary='ok', top_drivers=[]),
+            performance={},
+            correlation_matrix={},
+        )
+        with patch('api.api.RiskCalculator') as calc_cls, \
+             patch('api.api._market_data.get_asset_metadata', return_value={}), \
+             patch('api.api.fetch_benchmark_data', return_value=None):
+            calc_cls.return_value.calculate_risk.return_value = stub
+            response = self.client.post(
+                '/api/analyze-fast',
+                data={"positions": [{"ticker": "AAPL", "quantity": 1, "asset_class": "Equity"}]},
+                content_type='application/json',
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_value'], 1000.0)
+        # The payload actually reached the calculator
+        portfolio = calc_cls.return_value.calculate_risk.call_args.args[0]
+        self.assertEqual(portfolio.positions[0].ticker, 'AAPL')
+
 class CloudStorageTests(TestCase):
-    def setUp(self):
-        self.client = Client()
-        self.user_a_email = "alice@example.com"
-        self.user_b_email = "bob@example.com"
+    user_a_email = "alice@example.com"
+    user_b_email = "bob@example.com"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # One patcher for the whole class: the dotted target is resolved
+        # once instead of per test, and each test just sets return_value
+        cls._verify_patcher = patch('api.auth.id_token.verify_oauth2_token')
+        cls.mock_verify = cls._verify_patcher.start()
+        cls.addClassCleanup(cls._verify_patcher.stop)
+
+    @classmethod
+    def setUpTestData(cls):
+        # Shared fixtures created once per class (inside a transaction
+        # each test rolls back) instead of per-test INSERTs in setUp.
+        # TestCase provides self.client itself, so no setUp is needed.
+        cls.user_a, cls.user_b = User.objects.bulk_create([
+            User(username=cls.user_a_email, email=cls.user_a_email),
+            User(username=cls.user_b_email, email=cls.user_b_email),
+        ])
 
-    @patch('api.auth.id_token.verify_oauth2_token')
-    def test_user_creation_and_persistence(self, mock_verify):
+    def test_user_creation_and_persistence(self):
         """
         Verify that:
         1. A user is created automatically upon first valid authentication.
@@ -19,16 +67,18 @@ class CloudStorageTests(TestCase):
         3. Portfolios can be retrieved (GET).
         4. Data persistence is accurate.
         """
-        # --- 1. Simulate First Login for Alice ---
-        mock_verify.return_value = {
-            'email': self.user_a_email,
-            'given_name': 'Alice',
+        # --- 1. Simulate First Login for Carol (not in the fixtures, so
+        # auto-creation is actually exercised) ---
+        new_email = "carol@example.com"
+        self.mock_verify.return_value = {
+            'email': new_email,
+            'given_name': 'Carol',
             'family_name': 'Test',
         }
 
         # Payload
         portfolio_data = {
-            "name": "Alice's Tech Stocks",
+            "name": "Carol's Tech Stocks",
             "description": "High growth",
             "positions": [
                 {"ticker": "AAPL", "quantity": 10, "asset_class": "Equity"},
@@ -41,24 +91,23 @@ class CloudStorageTests(TestCase):
             '/api/portfolios',
             data=portfolio_data,
             content_type='application/json',
-            HTTP_AUTHORIZATION='Bearer valid_token_alice'
+            HTTP_AUTHORIZATION='Bearer valid_token_carol'
         )
 
         # Assert User Creation
         self.assertEqual(response.status_code, 200)
-        self.assertTrue(User.objects.filter(username=self.user_a_email).exists())
-        user_a = User.objects.get(username=self.user_a_email)
+        self.assertTrue(User.objects.filter(username=new_email).exists())
         
         # Assert Response (Summary only)
         res_json = response.json()
-        self.assertEqual(res_json['name'], "Alice's Tech Stocks")
+        self.assertEqual(res_json['name'], "Carol's Tech Stocks")
         # positions not in summary
         portfolio_id = res_json['id']
 
         # --- 2. Retrieve Portfolio Details (Persistence) ---
         response_detail = self.client.get(
             f'/api/portfolios/{portfolio_id}',
-            HTTP_AUTHORIZATION='Bearer valid_token_alice'
+            HTTP_AUTHORIZATION='Bearer valid_token_carol'
         )
         self.assertEqual(response_detail.status_code, 200)
         detail_json = response_detail.json()
@@ -68,7 +117,7 @@ class CloudStorageTests(TestCase):
         # --- 3. Retrieve Portfolio List ---
         response_get = self.client.get(
             '/api/portfolios',
-            HTTP_AUTHORIZATION='Bearer valid_token_alice'
+            HTTP_AUTHORIZATION='Bearer valid_token_carol'
         )
         self.assertEqual(response_get.status_code, 200)
         portfolios = response_get.json()
@@ -76,25 +125,20 @@ class CloudStorageTests(TestCase):
         self.assertEqual(portfolios[0]['id'], portfolio_id)
 
 
-    @patch('api.auth.id_token.verify_oauth2_token')
-    def test_data_isolation(self, mock_verify):
+    def test_data_isolation(self):
         """
         Verify that User A cannot access User B's portfolios.
         """
-        # --- 1. Setup User A and their portfolio ---
-        # We manually create users here to save mocking complexity for setup
-        user_a = User.objects.create(username=self.user_a_email, email=self.user_a_email)
-        user_b = User.objects.create(username=self.user_b_email, email=self.user_b_email)
-
+        # --- 1. Setup User A's portfolio (users come from setUpTestData) ---
         p_a = SavedPortfolio.objects.create(
-            user=user_a,
+            user=self.user_a,
             name="Alice's Secret",
             positions=[],
         )
 
         # --- 2. User B tries to access User A's portfolio ---
         # Mock Auth as User B
-        mock_verify.return_value = {
+        self.mock_verify.return_value = {
             'email': self.user_b_email, 
             'given_name': 'Bob', 
             'family_name': 'Test'
@@ -115,12 +159,77 @@ class CloudStorageTests(TestCase):
         self.assertEqual(response_list.status_code, 200)
         self.assertEqual(len(response_list.json()), 0) # Should verify B sees nothing
 
-    @patch('api.auth.id_token.verify_oauth2_token')
-    def test_delete_portfolio(self, mock_verify):
-        user_a = User.objects.create(username=self.user_a_email, email=self.user_a_email)
-        p_a = SavedPortfolio.objects.create(user=user_a, name="To Delete", positions=[])
+    def test_bulk_upsert_portfolios(self):
+        """
+        Verify that /portfolios/bulk inserts new portfolios and updates
+        existing ones by (user, name) in a single call.
+        """
+        SavedPortfolio.objects.create(
+            user=self.user_a,
+            name="Existing",
+            positions=[{"ticker": "A", "quantity": 1}]
+        )
+
+        self.mock_verify.return_value = {'email': self.user_a_email}
+
+        payload = [
+            {"name": "Existing", "positions": [{"ticker": "B", "quantity": 2}]},
+            {"name": "Brand New", "positions": []},
+            # Duplicate name in one batch: last entry wins (Postgres
+            # forbids updating the same row twice in one upsert)
+            {"name": "Existing", "positions": [{"ticker": "C", "quantity": 3}]},
+        ]
+        response = self.client.post(
+            '/api/portfolios/bulk',
+            data=payload,
+            content_type='application/json',
+            HTTP_AUTHORIZATION='Bearer valid_token_alice'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+        # Existing portfolio updated in place, not duplicated
+        self.assertEqual(SavedPortfolio.objects.filter(user=self.user_a).count(), 2)
+        existing = SavedPortfolio.objects.get(user=self.user_a, name="Existing")
+        self.assertEqual(existing.positions[0]['ticker'], 'C')
+
+        # Normalized rows follow the JSON through the bulk path
+        self.assertEqual(
+            list(Position.objects.filter(portfolio=existing).values_list('ticker', flat=True)),
+            ['C']
+        )
+
+    def test_list_portfolios_ndjson(self):
+        """
+        Verify that ?format=ndjson streams one JSON object per line.
+        """
+        # bulk_create is fine here: no positions, so the skipped
+        # sync_position_rows hook has nothing to do
+        SavedPortfolio.objects.bulk_create([
+            SavedPortfolio(user=self.user_a, name="First", positions=[]),
+            SavedPortfolio(user=self.user_a, name="Second", positions=[]),
+        ])
+
+        self.mock_verify.return_value = {'email': self.user_a_email}
+
+        response = self.client.get(
+            '/api/portfolios?format=ndjson',
+            HTTP_AUTHORIZATION='Bearer valid_token_alice'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = b''.join(response.streaming_content).strip().split(b'\n')
+        self.assertEqual(len(lines), 2)
+        rows = [json.loads(line) for line in lines]
+        # Newest first, positions never included in summaries
+        self.assertEqual(rows[0]['name'], 'Second')
+        self.assertNotIn('positions', rows[0])
+
+    def test_delete_portfolio(self):
+        p_a = SavedPortfolio.objects.create(user=self.user_a, name="To Delete", positions=[])
 
-        mock_verify.return_value = {'email': self.user_a_email}
+        self.mock_verify.return_value = {'email': self.user_a_email}
 
         response = self.client.delete(
             f'/api/portfolios/{p_a.id}',
@@ -129,20 +238,18 @@ class CloudStorageTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(SavedPortfolio.objects.count(), 0)
 
-    @patch('api.auth.id_token.verify_oauth2_token')
-    def test_update_portfolio(self, mock_verify):
+    def test_update_portfolio(self):
         """
         Verify that a user can update their existing portfolio (PUT).
         """
         # 1. Create Portfolio via Model
-        user_a = User.objects.create(username=self.user_a_email, email=self.user_a_email)
         p = SavedPortfolio.objects.create(
-            user=user_a, 
+            user=self.user_a,
             name="Original Name", 
             positions=[{"ticker": "A", "quantity": 1}]
         )
         
-        mock_verify.return_value = {'email': self.user_a_email}
+        self.mock_verify.return_value = {'email': self.user_a_email}
 
         # 2. Update Payload
         update_data = {
@@ -3,18 +3,30 @@
 """Django's command-line utility for administrative tasks."""
 import os
 import sys
+from pathlib import Path
+
+
+def _load_env(path):
+    """
+    Minimal .env loader: KEY=VALUE lines, comments and blanks skipped.
+
+    Replaces the python-dotenv import (and its regex parsing) on every
+    command startup; variables already in the environment always win.
+    """
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        return
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#') and '=' in line:
+            key, value = line.split('=', 1)
+            os.environ.setdefault(key.strip(), value.strip().strip('"').strip("'"))
 
 
 def main():
     """Run administrative tasks."""
-    # Load environment variables from .env
-    try:
-        import dotenv
-        from pathlib import Path
-        env_path = Path(__file__).resolve().parent / '.env'
-        dotenv.load_dotenv(env_path)
-    except ImportError:
-        print("Warning: python-dotenv not installed, .env file not loaded.")
+    _load_env(Path(__file__).resolve().parent / '.env')
 
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'risklens.settings')
     try:
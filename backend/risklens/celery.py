@@ -6,4 +6,13 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'risklens.settings')
 
 app = Celery('risklens')
 app.config_from_object('django.conf:settings', namespace='CELERY')
-app.autodiscover_tasks()
+
+# Only api ships tasks; scanning the rest of INSTALLED_APPS (corsheaders,
+# ninja) at worker boot imports them for nothing
+app.autodiscover_tasks(['api'])
+
+# Route risk calculations to their own queue so heavy workers can be
+# scaled apart from any future lightweight tasks on the default queue
+app.conf.task_routes = {
+    'api.tasks.calculate_risk_async': {'queue': 'risk'},
+}
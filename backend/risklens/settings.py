@@ -44,22 +44,69 @@ try:
 except Exception:
     pass
 
+# SQLite tuning for dev and tests (production runs Postgres via
+# DATABASE_URL and never reaches this branch): WAL lets readers proceed
+# alongside a writer and synchronous=NORMAL drops the per-transaction
+# fsync, while IMMEDIATE transactions avoid deadlocks on write upgrades.
+if DATABASES['default']['ENGINE'].endswith('sqlite3'):
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA temp_store=MEMORY;'
+            'PRAGMA mmap_size=268435456;'
+            'PRAGMA cache_size=-64000;'
+        ),
+        'transaction_mode': 'IMMEDIATE',
+    })
+
 
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
-USE_I18N = True
+# JSON-only API: no templates or translated strings, so skip the
+# per-request locale machinery. Timestamps stay timezone-aware.
+USE_I18N = False
 USE_TZ = True
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache Configuration (same Redis instance Celery uses, separate DB)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_CACHE_URL', 'redis://localhost:6379/1'),
+    }
+}
+
 # Celery Configuration
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
-CELERY_ACCEPT_CONTENT = ['json']
-CELERY_TASK_SERIALIZER = 'json'
-CELERY_RESULT_SERIALIZER = 'json'
+# msgpack packs floats as 9-byte IEEE754 binary instead of decimal
+# strings, roughly halving broker/result bytes for position and shock
+# payloads; json stays accepted for messages from older producers
+CELERY_ACCEPT_CONTENT = ['msgpack', 'json']
+CELERY_TASK_SERIALIZER = 'msgpack'
+CELERY_RESULT_SERIALIZER = 'msgpack'
+# Risk results run 10-50 KiB and round-trip through Redis twice;
+# compressing them is cheap next to the market-data fetches they contain
+CELERY_TASK_COMPRESSION = 'zstd'
+CELERY_RESULT_COMPRESSION = 'zstd'
 CELERY_TIMEZONE = 'UTC'
 
+# Broker tuning for long-running risk tasks on Redis: a shared producer
+# connection pool, a visibility timeout comfortably above the slowest
+# task so unacked messages aren't redelivered mid-run, and late acks
+# with prefetch 1 so a restarted worker re-runs (rather than loses) its
+# in-flight task and idle workers aren't starved by hoarded prefetches.
+CELERY_BROKER_POOL_LIMIT = 50
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'visibility_timeout': 7200,
+    'socket_keepalive': True,
+    'health_check_interval': 30,
+}
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     'http://localhost:3000',
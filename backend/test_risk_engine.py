@@ -26,7 +26,11 @@ def print_section(text):
 def test_basic_portfolio():
     """Test basic portfolio risk calculation"""
     print_header("TEST 1: BASIC PORTFOLIO RISK CALCULATION")
-    
+
+    if not os.environ.get('RISKLENS_LIVE_TESTS'):
+        print("⏭️  SKIPPED (set RISKLENS_LIVE_TESTS=1 to run live yfinance tests)")
+        return None
+
     print("📊 Creating sample portfolio...")
     portfolio = Portfolio(positions=[
         PortfolioPosition(ticker="AAPL", quantity=100, asset_class="Equity"),
@@ -78,7 +82,11 @@ def test_basic_portfolio():
 def test_scenario_analysis():
     """Test scenario analysis with market shock"""
     print_header("TEST 2: SCENARIO ANALYSIS (MARKET CRASH)")
-    
+
+    if not os.environ.get('RISKLENS_LIVE_TESTS'):
+        print("⏭️  SKIPPED (set RISKLENS_LIVE_TESTS=1 to run live yfinance tests)")
+        return None
+
     portfolio = Portfolio(positions=[
         PortfolioPosition(ticker="AAPL", quantity=100, asset_class="Equity"),
         PortfolioPosition(ticker="MSFT", quantity=50, asset_class="Equity"),
@@ -117,7 +125,11 @@ def test_scenario_analysis():
 def test_error_handling():
     """Test error handling for invalid tickers"""
     print_header("TEST 3: ERROR HANDLING (INVALID TICKER)")
-    
+
+    if not os.environ.get('RISKLENS_LIVE_TESTS'):
+        print("⏭️  SKIPPED (set RISKLENS_LIVE_TESTS=1 to run live yfinance tests)")
+        return None
+
     portfolio = Portfolio(positions=[
         PortfolioPosition(ticker="INVALIDTICKER123", quantity=100, asset_class="Equity"),
     ])
@@ -157,19 +169,23 @@ def main():
     # Test 3: Error handling
     results.append(("Error Handling", test_error_handling()))
     
-    # Summary
+    # Summary (None = skipped, which never counts as a failure)
     print_header("TEST SUMMARY")
-    passed = sum(1 for _, result in results if result)
-    total = len(results)
+    passed = sum(1 for _, result in results if result is True)
+    failed = sum(1 for _, result in results if result is False)
+    skipped = sum(1 for _, result in results if result is None)
     
     for test_name, result in results:
-        status = "✅ PASS" if result else "❌ FAIL"
+        status = "✅ PASS" if result else ("⏭️  SKIP" if result is None else "❌ FAIL")
         print(f"{status}: {test_name}")
     
-    print(f"\n{passed}/{total} tests passed")
+    print(f"\n{passed} passed, {failed} failed, {skipped} skipped")
     
-    if passed == total:
-        print_header("🎉 ALL TESTS PASSED! SYSTEM IS WORKING PROPERLY! ��")
+    if failed == 0:
+        if skipped:
+            print_header("✅ NO FAILURES (live tests skipped)")
+        else:
+            print_header("🎉 ALL TESTS PASSED! SYSTEM IS WORKING PROPERLY! ��")
         return 0
     else:
         print_header("❌ SOME TESTS FAILED")
@@ -62,7 +62,8 @@ export default function CorrelationHeatmap({ data }: CorrelationHeatmapProps) {
                                         {ticker1}
                                     </td>
                                     {tickers.map((ticker2, j) => {
-                                        const correlation = corrMap.get(`${ticker1}-${ticker2}`) || 0
+                                        // Backend sends the upper triangle only; mirror for the lower half
+                                        const correlation = corrMap.get(`${ticker1}-${ticker2}`) ?? corrMap.get(`${ticker2}-${ticker1}`) ?? 0
                                         const bgColor = getCorrelationColor(correlation)
                                         const textColor = getTextColor(correlation)
 